@@ -21,21 +21,55 @@ import shutil
 import sys
 from pathlib import Path
 import base64
+import filecmp
+import hashlib
+import io
+import tempfile
 from typing import Optional, Tuple
+from collections import OrderedDict
+import http.client
 import http.server
+import queue
+import random
+import threading
+import urllib.parse
 import socketserver
 from functools import partial
 import time
+import json
+import struct
+import zlib
+import signal
+import socket
+import contextlib
+import gc
+import multiprocessing
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 try:
-    from PIL import Image  # type: ignore
+    from PIL import Image, ImageSequence  # type: ignore
 except ImportError:  # pragma: no cover
     Image = None  # Pillow is optional unless --stego is used
+    ImageSequence = None
 
 
 IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".svg"}
 VIDEO_EXTS = {".mp4", ".webm", ".ogg", ".mov", ".mkv"}
 
+# Fingerprinted assets (<stem>.<hash>.<ext>) never change under the same name.
+FINGERPRINT_LENGTH = 10
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Embed-mode iframe warming and <video preload> strategies for generated pages.
+WARM_CHOICES = ("off", "hover", "pointerdown")
+VIDEO_PRELOAD_CHOICES = ("none", "metadata", "auto")
+
+# Peak bytes allowed per input byte by the --memprofile regression gate.
+DEFAULT_MEMORY_BUDGET = 8.0
+DEFAULT_RSS_BUDGET = 12.0
+
 # ANSI color codes for terminal output
 class Colors:
     RED = '\033[91m'
@@ -49,6 +83,64 @@ class Colors:
     UNDERLINE = '\033[4m'
     END = '\033[0m'
 
+class LRUCache:
+    """Least-recently-used mapping bounded by entry count and by total weight"""
+
+    def __init__(self, max_entries: int, max_weight: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self._items: "OrderedDict[object, Tuple[object, int]]" = OrderedDict()
+        self._weight = 0
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: object, default: object = None) -> object:
+        if key not in self._items:
+            return default
+        self._items.move_to_end(key)
+        return self._items[key][0]
+
+    def put(self, key: object, value: object, weight: int = 1) -> None:
+        if key in self._items:
+            self._weight -= self._items.pop(key)[1]
+        if self.max_weight is not None and weight > self.max_weight:
+            return  # would evict everything else and still not fit
+        self._items[key] = (value, weight)
+        self._weight += weight
+        while len(self._items) > self.max_entries or (
+            self.max_weight is not None and self._weight > self.max_weight
+        ):
+            self._weight -= self._items.popitem(last=False)[1][1]
+
+
+# Pipelined jobs may share an output directory and its asset manifest.
+_manifest_lock = threading.Lock()
+
+# Caches shared across jobs by long-lived processes (see enable_job_caches).
+_carrier_cache: Optional[LRUCache] = None
+_probe_cache: Optional[LRUCache] = None
+
+
+def enable_job_caches(max_carrier_bytes: int, max_probe_entries: int = 4096) -> None:
+    """Keep decoded carriers and header probes in memory between jobs"""
+    global _carrier_cache, _probe_cache
+    _carrier_cache = LRUCache(max_entries=max_probe_entries, max_weight=max_carrier_bytes)
+    _probe_cache = LRUCache(max_entries=max_probe_entries)
+
+
+def _file_cache_key(path: Path) -> Optional[Tuple[str, int, int]]:
+    # A changed file gets a new key, so stale entries simply age out.
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return str(Path(path).resolve()), st.st_mtime_ns, st.st_size
+
+
 def print_logo():
     """Display the NWExX Tools logo with skull background"""
     logo = f"""
@@ -288,12 +380,18 @@ def interactive_mode():
             print(f"\n{Colors.GREEN}👋 Thank you for using Stego Linker! Goodbye!{Colors.END}")
             break
 
-def run_generation(media_path: Path, url: str, mode: str, out_dir: Path, title: str, format_type: str, stego: bool, serve: bool) -> int:
-    """Run the generation process with given parameters"""
+def run_generation(media_path: Path, url: str, mode: str, out_dir: Path, title: str, format_type: str, stego: bool, serve: bool, fingerprint: bool = False, outputs: Optional[dict] = None, animated: bool = False, frames: int = 1, warm: str = "off", video_preload: str = "metadata") -> int:
+    """
+    Run the generation process with given parameters.
+    If an outputs dict is passed it is filled with the names of the written
+    files, or on failure with the error message under "error".
+    """
     # This is a simplified version of the main function logic
-    error = validate_inputs(media_path, url, mode)
+    error = validate_inputs(media_path, url, mode, stego, frames if animated else 1)
     if error:
         print(f"{Colors.RED}❌ Error: {error}{Colors.END}")
+        if outputs is not None:
+            outputs["error"] = error
         return 2
 
     # Prepare output
@@ -303,53 +401,190 @@ def run_generation(media_path: Path, url: str, mode: str, out_dir: Path, title:
     else:
         print(f"{Colors.BLUE}📁 Using existing directory: {out_dir}{Colors.END}")
 
-    # Copy media to output directory
-    media_filename = copy_media(media_path, out_dir)
+    try:
+        written = build_outputs(
+            media_path, url, mode, out_dir, title, format_type, stego, fingerprint, animated, frames, warm, video_preload
+        )
+    except Exception as exc:
+        print(f"{Colors.RED}❌ Error: {exc}{Colors.END}")
+        if outputs is not None:
+            outputs["error"] = str(exc)
+        return 2
+    if outputs is not None:
+        outputs.update(written)
+
+    if written["stego"]:
+        print(f"{Colors.GREEN}🔐 Embedded hidden URL into: {out_dir / written['stego']}{Colors.END}")
+    if format_type == "markdown":
+        print(f"{Colors.GREEN}📝 Markdown snippet created: {out_dir / written['output']}{Colors.END}")
+    elif format_type == "svg":
+        print(f"{Colors.GREEN}🖼️ Clickable SVG created: {out_dir / written['output']}{Colors.END}")
+    else:
+        print(f"{Colors.GREEN}📄 HTML page created: {out_dir / written['output']}{Colors.END}")
+    return 0
+
+
+def build_outputs(
+    media_path: Path,
+    url: str,
+    mode: str,
+    out_dir: Path,
+    title: str,
+    format_type: str,
+    stego: bool,
+    fingerprint: bool = False,
+    animated: bool = False,
+    frames: int = 1,
+    warm: str = "off",
+    video_preload: str = "metadata",
+) -> dict:
+    """
+    Copy the media, optionally embed the stego PNG and write the requested
+    output into out_dir. Inputs must already be validated. With animated, an
+    animated GIF/WebP carrier keeps its animation (see
+    embed_lsb_message_into_animation) instead of being flattened.
+    Returns the written file names as {"media", "stego" (or None), "output"}.
+    """
+    job = {
+        "media_path": media_path,
+        "url": url,
+        "mode": mode,
+        "out_dir": out_dir,
+        "title": title,
+        "format_type": format_type,
+        "stego": stego,
+        "fingerprint": fingerprint,
+        "animated": animated,
+        "frames": frames,
+        "warm": warm,
+        "video_preload": video_preload,
+    }
+    stage_copy(job)
+    stage_encode(job)
+    return stage_write(job)
+
+
+# build_outputs is split into three stages so bulk runs can pipeline them
+# (see run_pipeline). Each stage takes and extends a job dict whose keys are
+# build_outputs' parameter names.
+
+def stage_copy(job: dict) -> dict:
+    """I/O stage: copy the media into the output directory"""
+    job["out_dir"].mkdir(parents=True, exist_ok=True)
+    job["media_filename"] = copy_media(job["media_path"], job["out_dir"], job["fingerprint"])
+    return job
+
+
+def needs_encode(job: dict) -> bool:
+    return bool(job["stego"]) and job["media_path"].suffix.lower() in IMAGE_EXTS
+
+
+def stage_encode(job: dict) -> dict:
+    """
+    CPU stage: decode, embed and encode the stego image. Still images leave
+    their PNG bytes in job["stego_png"]; animated carriers are streamed
+    straight to out_dir/<stem>_stego.png and set job["stego_streamed"].
+    """
+    if not needs_encode(job):
+        return job
+    media_path = job["media_path"]
+    if job["animated"] and is_animated_image(media_path):
+        logical_name = derive_stego_name(media_path.name)
+        embed_lsb_message_into_animation(media_path, job["url"], job["out_dir"] / logical_name, job["frames"])
+        job["stego_streamed"] = True
+    else:
+        job["stego_png"] = encode_lsb_message_png(media_path, job["url"])
+    return job
+
+
+def stage_write(job: dict) -> dict:
+    """I/O stage: write the stego image and the requested output; returns the written file names"""
+    media_path = job["media_path"]
+    out_dir = job["out_dir"]
+    url = job["url"]
+    fingerprint = job["fingerprint"]
+    media_filename = job["media_filename"]
     media_kind = "image" if media_path.suffix.lower() in IMAGE_EXTS else "video"
+    assets = {media_path.name: media_filename}
 
     # Optionally embed the URL invisibly into a PNG
     stego_filename: Optional[str] = None
-    if stego and media_kind == "image":
-        try:
-            stego_filename = derive_stego_name(media_filename)
-            embed_lsb_message_into_image(out_dir / media_filename, url, out_dir / stego_filename)
-            print(f"{Colors.GREEN}🔐 Embedded hidden URL into: {out_dir / stego_filename}{Colors.END}")
-        except Exception as exc:
-            print(f"{Colors.RED}❌ Error embedding stego message: {exc}{Colors.END}")
-            return 2
-
+    logical_name = derive_stego_name(media_path.name)
+    if job.get("stego_streamed"):
+        stego_filename = fingerprint_file(out_dir, logical_name) if fingerprint else logical_name
+    elif job.get("stego_png") is not None:
+        stego_filename = write_asset(out_dir, logical_name, job["stego_png"], fingerprint)
+    if stego_filename:
+        assets[logical_name] = stego_filename
+
+    format_type = job["format_type"]
     if format_type == "markdown":
         md_image = stego_filename or media_filename
         snippet = f"[![clickable media]({md_image})]({url})\n"
-        write_file(out_dir / "README_snippet.md", snippet)
-        print(f"{Colors.GREEN}📝 Markdown snippet created: {out_dir / 'README_snippet.md'}{Colors.END}")
-        return 0
-
-    if format_type == "svg":
+        output_name = "README_snippet.md"
+        write_file(out_dir / output_name, snippet)
+    elif format_type == "svg":
         svg_source = out_dir / (stego_filename or media_filename)
         svg_content = generate_clickable_svg(svg_source, url)
-        svg_name = f"{Path(svg_source).stem}.svg"
-        svg_path = out_dir / svg_name
-        write_file(svg_path, svg_content)
-        print(f"{Colors.GREEN}🖼️ Clickable SVG created: {svg_path}{Colors.END}")
-        return 0
+        logical_name = f"{Path(derive_stego_name(media_path.name) if stego_filename else media_path.name).stem}.svg"
+        output_name = write_asset(out_dir, logical_name, svg_content.encode("utf-8"), fingerprint)
+        assets[logical_name] = output_name
+    else:
+        html = generate_html(
+            title=job["title"],
+            media_filename=media_filename,
+            media_kind=media_kind,
+            target_url=url,
+            mode=job["mode"],
+            media_size=probe_image_size(media_path) if media_kind == "image" else None,
+            warm=job["warm"],
+            video_preload=job["video_preload"],
+        )
+        output_name = "index.html"
+        write_file(out_dir / output_name, html)
+        # Write a .nojekyll to make GitHub Pages serve files as-is
+        write_file(out_dir / ".nojekyll", "")
 
-    # Default: HTML output
-    html = generate_html(
-        title=title,
-        media_filename=media_filename,
-        media_kind=media_kind,
-        target_url=url,
-        mode=mode,
-    )
-    write_file(out_dir / "index.html", html)
-    write_file(out_dir / ".nojekyll", "")
-    print(f"{Colors.GREEN}📄 HTML page created: {out_dir / 'index.html'}{Colors.END}")
-    
+    if fingerprint:
+        write_cache_manifest(out_dir, assets)
+
+    return {"media": media_filename, "stego": stego_filename, "output": output_name}
+
+
+def run_fanout(media_path: Path, urls_file: Path, out_dir: Path, workers: Optional[int] = None) -> int:
+    """Embed every URL listed in urls_file into its own stego copy of media_path"""
+    if not urls_file.exists() or not urls_file.is_file():
+        print(f"{Colors.RED}❌ Error: URL list not found: {urls_file}{Colors.END}")
+        return 2
+    urls = [line.strip() for line in urls_file.read_text(encoding="utf-8").splitlines() if line.strip()]
+    if not urls:
+        print(f"{Colors.RED}❌ Error: URL list is empty: {urls_file}{Colors.END}")
+        return 2
+    for url in urls:
+        error = validate_inputs(media_path, url, "redirect", stego=True)
+        if error:
+            print(f"{Colors.RED}❌ Error: {error}{Colors.END}")
+            return 2
+    if media_path.suffix.lower() not in IMAGE_EXTS:
+        print(f"{Colors.RED}❌ Error: --fanout requires an image carrier{Colors.END}")
+        return 2
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    names = [derive_fanout_name(media_path.name, i) for i in range(len(urls))]
+    try:
+        embed_lsb_messages_fanout(media_path, urls, [out_dir / name for name in names], workers)
+    except Exception as exc:
+        print(f"{Colors.RED}❌ Error embedding stego message: {exc}{Colors.END}")
+        return 2
+
+    manifest = {name: url for name, url in zip(names, urls)}
+    write_file(out_dir / "fanout_manifest.json", json.dumps(manifest, indent=2) + "\n")
+    print(f"{Colors.GREEN}🔐 Embedded {len(urls)} URLs into stego copies of: {media_path.name}{Colors.END}")
+    print(f"{Colors.GREEN}📋 Manifest created: {out_dir / 'fanout_manifest.json'}{Colors.END}")
     return 0
 
 
-def validate_inputs(media_path: Path, url: str, mode: str) -> str:
+def validate_inputs(media_path: Path, url: str, mode: str, stego: bool = False, stego_frames: int = 1) -> str:
     if not media_path.exists() or not media_path.is_file():
         return f"Media file not found: {media_path}"
     if not (url.startswith("http://") or url.startswith("https://")):
@@ -362,21 +597,207 @@ def validate_inputs(media_path: Path, url: str, mode: str) -> str:
             f"Unsupported media extension '{ext}'. Supported images: {sorted(IMAGE_EXTS)}; "
             f"videos: {sorted(VIDEO_EXTS)}"
         )
+    if stego_frames < 1:
+        return "--frames must be at least 1"
+    if stego and ext in IMAGE_EXTS:
+        if stego_frames > 1:
+            # The payload can only be spread over frames that exist.
+            stego_frames = min(stego_frames, animation_frame_count(media_path))
+        size = probe_image_size(media_path)
+        needed = len(url.encode("utf-8"))
+        # Spread payloads carry one length header per frame.
+        capacity = stego_capacity_bytes(size) * stego_frames if size else 0
+        if size and needed > capacity:
+            where = f"{stego_frames} frames of " if stego_frames > 1 else ""
+            return (
+                f"URL is too long to hide in {where}a {size[0]}x{size[1]} image: "
+                f"needs {needed} bytes, capacity is {capacity} bytes"
+            )
     return ""
 
 
 def write_file(path: Path, content: str) -> None:
+    write_bytes_atomic(path, content.encode("utf-8"))
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> bool:
+    """
+    Replace path with data via a fsynced temp file and an atomic rename, so a
+    server never sees a half-written file. If path already holds exactly these
+    bytes it is left untouched, keeping its mtime (and HTTP validators) stable.
+    Returns True when the file was (re)written.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    if _file_equals(path, data):
+        return False
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        _replace_atomic(Path(tmp_name), path)
+    except BaseException:
+        _unlink_quietly(Path(tmp_name))
+        raise
+    return True
+
+
+def _file_equals(path: Path, data: bytes) -> bool:
+    # Chunked so checking a large output never holds a second full copy.
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        view = memoryview(data)
+        offset = 0
+        with open(path, "rb") as fh:
+            for chunk in iter(partial(fh.read, 1 << 20), b""):
+                if view[offset:offset + len(chunk)] != chunk:
+                    return False
+                offset += len(chunk)
+        return offset == len(data)
+    except OSError:
+        return False
+
+
+@contextlib.contextmanager
+def atomic_writer(path: Path):
+    """
+    Streaming counterpart of write_bytes_atomic: yields a binary file that
+    replaces path on success. Identical content leaves path untouched.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            yield fh
+            fh.flush()
+            os.fsync(fh.fileno())
+        if path.exists() and filecmp.cmp(tmp_path, path, shallow=False):
+            _unlink_quietly(tmp_path)
+        else:
+            _replace_atomic(tmp_path, path)
+    except BaseException:
+        _unlink_quietly(tmp_path)
+        raise
 
 
-def copy_media(src: Path, dest_dir: Path) -> str:
+def copy_media(src: Path, dest_dir: Path, fingerprint: bool = False) -> str:
     dest_dir.mkdir(parents=True, exist_ok=True)
-    dest_path = dest_dir / src.name
-    shutil.copy2(src, dest_path)
+    dest_name = fingerprint_name(src.name, file_digest(src)) if fingerprint else src.name
+    dest_path = dest_dir / dest_name
+    if dest_path.exists() and filecmp.cmp(src, dest_path, shallow=False):
+        return dest_path.name
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{dest_path.name}.", suffix=".tmp", dir=dest_dir)
+    os.close(fd)
+    try:
+        shutil.copy2(src, tmp_name)
+        with open(tmp_name, "rb+") as fh:
+            os.fsync(fh.fileno())
+        _replace_atomic(Path(tmp_name), dest_path)
+    except BaseException:
+        _unlink_quietly(Path(tmp_name))
+        raise
     return dest_path.name
 
 
+def write_asset(out_dir: Path, logical_name: str, data: bytes, fingerprint: bool = False) -> str:
+    """Write data under logical_name, or its content-hashed name when fingerprinting; returns the name used"""
+    name = fingerprint_name(logical_name, hashlib.sha256(data).hexdigest()) if fingerprint else logical_name
+    write_bytes_atomic(out_dir / name, data)
+    return name
+
+
+def fingerprint_file(out_dir: Path, logical_name: str) -> str:
+    """Move an already written out_dir/logical_name to its content-hashed name; returns that name"""
+    source = out_dir / logical_name
+    name = fingerprint_name(logical_name, file_digest(source))
+    if (out_dir / name).exists():
+        # Same hash, same bytes: keep the existing file and its validators.
+        source.unlink()
+    else:
+        os.replace(source, out_dir / name)
+    return name
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(partial(fh.read, 1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_name(filename: str, hex_digest: str) -> str:
+    # photo.jpg -> photo.<hash>.jpg
+    path = Path(filename)
+    return f"{path.stem}.{hex_digest[:FINGERPRINT_LENGTH]}{path.suffix}"
+
+
+def write_cache_manifest(out_dir: Path, assets: dict) -> None:
+    """
+    Merge assets ({logical name: fingerprinted name}) into out_dir/asset-manifest.json
+    and regenerate out_dir/_headers, which marks every fingerprinted file as
+    immutable and keeps entry points such as index.html revalidating.
+    """
+    with _manifest_lock:
+        _write_cache_manifest(out_dir, assets)
+
+
+def _write_cache_manifest(out_dir: Path, assets: dict) -> None:
+    manifest_path = out_dir / "asset-manifest.json"
+    manifest: dict = {}
+    if manifest_path.exists():
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except ValueError:
+            manifest = {}
+    manifest.update(assets)
+    manifest = dict(sorted(manifest.items()))
+    write_file(manifest_path, json.dumps(manifest, indent=2) + "\n")
+
+    rules = []
+    for entry in ("/", "/index.html", "/asset-manifest.json"):
+        rules.append(f"{entry}\n  Cache-Control: no-cache\n")
+    for name in sorted(set(manifest.values())):
+        rules.append(f"/{name}\n  Cache-Control: {IMMUTABLE_CACHE_CONTROL}\n")
+    write_file(out_dir / "_headers", "\n".join(rules))
+
+
+def _replace_atomic(tmp_path: Path, dest_path: Path) -> None:
+    # mkstemp creates 0600 files; generated output is meant to be served.
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, dest_path)
+    # Persist the rename itself. Directories cannot be opened on Windows.
+    try:
+        dir_fd = os.open(dest_path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def _unlink_quietly(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def encode_png(img: "Image.Image") -> bytes:
+    # Pillow writes no timestamps into PNGs, so identical pixels give identical bytes.
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
 def guess_image_mime(ext: str) -> str:
     ext = ext.lower()
     if ext == ".png":
@@ -395,19 +816,112 @@ def guess_image_mime(ext: str) -> str:
     return "application/octet-stream"
 
 
+def probe_image_size(image_path: Path) -> Optional[Tuple[int, int]]:
+    """
+    Return (width, height) by parsing only the file header of a PNG, JPEG,
+    GIF, WebP or BMP image; no pixels are decoded and Pillow is not needed.
+    Returns None for other or malformed files.
+    """
+    if _probe_cache is None:
+        return _probe_image_size(image_path)
+    key = _file_cache_key(image_path)
+    if key is None:
+        return None
+    if key not in _probe_cache:
+        _probe_cache.put(key, _probe_image_size(image_path))
+    return _probe_cache.get(key)
+
+
+def _probe_image_size(image_path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        with open(image_path, "rb") as fh:
+            head = fh.read(32)
+            if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+                return int.from_bytes(head[16:20], "big"), int.from_bytes(head[20:24], "big")
+            if head[:6] in (b"GIF87a", b"GIF89a"):
+                return int.from_bytes(head[6:8], "little"), int.from_bytes(head[8:10], "little")
+            if head.startswith(b"BM") and len(head) >= 26:
+                if int.from_bytes(head[14:18], "little") == 12:  # OS/2 BITMAPCOREHEADER
+                    return int.from_bytes(head[18:20], "little"), int.from_bytes(head[20:22], "little")
+                width = int.from_bytes(head[18:22], "little", signed=True)
+                height = int.from_bytes(head[22:26], "little", signed=True)
+                return abs(width), abs(height)  # negative height means top-down rows
+            if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+                return _probe_webp(head)
+            if head[:2] == b"\xff\xd8":
+                fh.seek(2)
+                return _probe_jpeg(fh)
+    except OSError:
+        return None
+    return None
+
+
+def _probe_webp(head: bytes) -> Optional[Tuple[int, int]]:
+    chunk = head[12:16]
+    if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+        return int.from_bytes(head[26:28], "little") & 0x3FFF, int.from_bytes(head[28:30], "little") & 0x3FFF
+    if chunk == b"VP8L" and head[20] == 0x2F:
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+    return None
+
+
+def _probe_jpeg(fh) -> Optional[Tuple[int, int]]:
+    # Walk marker segments until a start-of-frame (SOFn) header.
+    while True:
+        byte = fh.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+        marker = fh.read(1)
+        while marker == b"\xff":  # fill bytes
+            marker = fh.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code == 0xD8 or code == 0x01 or 0xD0 <= code <= 0xD7:
+            continue  # standalone markers carry no length
+        if code in (0xD9, 0xDA):
+            return None  # end of image / start of scan before any frame header
+        length_bytes = fh.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = int.from_bytes(length_bytes, "big")
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            frame = fh.read(5)
+            if len(frame) < 5:
+                return None
+            return int.from_bytes(frame[3:5], "big"), int.from_bytes(frame[1:3], "big")
+        fh.seek(length - 2, os.SEEK_CUR)
+
+
+def stego_capacity_bytes(size: Tuple[int, int]) -> int:
+    """Largest message, in UTF-8 bytes, that fits an RGB image of this size"""
+    width, height = size
+    return max(0, width * height * 3 // 8 - 4)
+
+
 def generate_clickable_svg(image_path: Path, target_url: str) -> str:
     # Embed the raster/vector image as a data URI and wrap in an <a> link.
     # Add a transparent rect so the entire SVG area is clickable.
-    data = image_path.read_bytes()
-    b64 = base64.b64encode(data).decode("ascii")
+    # The base64 text is the bulk of the output: encode it straight from the
+    # file read (so the raw bytes are released at once) and splice it into the
+    # document with a single join rather than through intermediate f-strings.
+    b64 = base64.b64encode(image_path.read_bytes()).decode("ascii")
     mime = guess_image_mime(image_path.suffix)
-    data_uri = f"data:{mime};base64,{b64}"
     escaped_url = html_escape(target_url)
 
-    # Try to use real intrinsic size if Pillow is available; otherwise fallback to 100x100 viewBox
+    # Read the intrinsic size from the file header; fall back to Pillow for
+    # anything the probe does not understand, then to a 100x100 viewBox
     vb_w = 100
     vb_h = 100
-    if Image is not None:
+    probed = probe_image_size(image_path)
+    if probed:
+        vb_w, vb_h = probed
+    elif Image is not None:
         try:
             with Image.open(image_path) as im:
                 vb_w, vb_h = im.size
@@ -415,16 +929,22 @@ def generate_clickable_svg(image_path: Path, target_url: str) -> str:
             pass
 
     onclick_js = "try{window.top.location.href='" + escaped_url + "'}catch(e){window.location.href='" + escaped_url + "'}"
-    svg = f"""
+    data_uri_prefix = f"data:{mime};base64,"
+    return "".join([
+        f"""
     <svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" width="100%" height="100%" viewBox="0 0 {vb_w} {vb_h}" preserveAspectRatio="xMidYMid meet" style="cursor:pointer" onclick="{onclick_js}" role="link" aria-label="Open link">
       <title>Open link</title>
       <a xlink:href="{escaped_url}" href="{escaped_url}" target="_top">
         <rect x="0" y="0" width="100%" height="100%" fill="transparent"/>
-        <image x="0" y="0" width="100%" height="100%" preserveAspectRatio="xMidYMid meet" xlink:href="{data_uri}" href="{data_uri}"/>
+        <image x="0" y="0" width="100%" height="100%" preserveAspectRatio="xMidYMid meet" xlink:href="{data_uri_prefix}""",
+        b64,
+        f'" href="{data_uri_prefix}',
+        b64,
+        """"/>
       </a>
     </svg>
-    """
-    return svg
+    """,
+    ])
 
 
 def ensure_pillow_installed() -> None:
@@ -442,47 +962,210 @@ def embed_lsb_message_into_image(source_image_path: Path, message: str, output_i
     Output is a PNG visually indistinguishable to the naked eye.
     Format: [32-bit message length in bytes][message bytes]
     """
+    write_bytes_atomic(output_image_path, encode_lsb_message_png(source_image_path, message))
+
+
+def encode_lsb_message_png(source_image_path: Path, message: str) -> bytes:
+    """Same as embed_lsb_message_into_image, but return the PNG bytes instead of writing them"""
+    img = load_rgb_carrier(source_image_path)
+    embed_lsb_payload(img, lsb_payload(message))
+    return encode_png(img)
+
+
+def load_rgb_carrier(source_image_path: Path) -> "Image.Image":
+    """
+    Decode an image to RGB. The caller owns the result and may modify it.
+    When the job caches are enabled (daemon mode) decoded carriers are
+    reused across jobs and each call returns a private copy.
+    """
     ensure_pillow_installed()
 
-    img = Image.open(source_image_path).convert("RGB")
-    width, height = img.size
-    pixels = list(img.getdata())  # list of (r,g,b)
-
-    # Prepare bitstream to embed
-    message_bytes = message.encode("utf-8")
-    length = len(message_bytes)
-    header = length.to_bytes(4, byteorder="big")
-    data = header + message_bytes
-    bits = []
-    for byte in data:
-        for bit_idx in range(7, -1, -1):
-            bits.append((byte >> bit_idx) & 1)
+    key = _file_cache_key(source_image_path) if _carrier_cache is not None else None
+    if key is not None:
+        cached = _carrier_cache.get(key)
+        if cached is not None:
+            return cached.copy()
+
+    with Image.open(source_image_path) as src:
+        img = src.convert("RGB")
+    if key is not None:
+        width, height = img.size
+        _carrier_cache.put(key, img.copy(), weight=width * height * 3)
+    return img
+
+
+def embed_lsb_messages_fanout(
+    source_image_path: Path,
+    messages: list[str],
+    output_paths: list[Path],
+    workers: Optional[int] = None,
+) -> None:
+    """
+    Embed each message into its own stego copy of a single carrier image.
+    The carrier is decoded once; every variant copies the shared RGB image,
+    patches only the rows holding its payload and is PNG-encoded on a worker thread.
+    """
+    if len(messages) != len(output_paths):
+        raise ValueError("messages and output_paths must have the same length")
+
+    carrier = load_rgb_carrier(source_image_path)
+
+    def encode_variant(message: str, output_image_path: Path) -> None:
+        variant = carrier.copy()
+        embed_lsb_payload(variant, lsb_payload(message))
+        write_bytes_atomic(output_image_path, encode_png(variant))
 
+    # Pillow releases the GIL while copying and encoding, so threads share the
+    # decoded carrier without pickling it into separate processes.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(encode_variant, m, o) for m, o in zip(messages, output_paths)]
+        for future in futures:
+            future.result()
+
+
+def embed_lsb_message_into_animation(
+    source_image_path: Path, message: str, output_image_path: Path, frames: int = 1
+) -> None:
+    """
+    Embed the message into an animated GIF/WebP carrier and write an animated
+    PNG (APNG), which is lossless so the LSBs survive and still plays in browsers.
+    With frames == 1 the whole payload goes into the first frame; otherwise the
+    UTF-8 message is split into up to min(frames, frame count) consecutive
+    chunks, each stored in its own frame with the usual [32-bit length][bytes]
+    header.
+    Frames are decoded, patched, compressed and written one at a time, so memory
+    stays bounded by a single frame.
+    """
+    ensure_pillow_installed()
+    if frames < 1:
+        raise ValueError("frames must be at least 1")
+
+    data = message.encode("utf-8")
+    with Image.open(source_image_path) as src:
+        n_frames = getattr(src, "n_frames", 1)
+        chunk_size = max(1, -(-len(data) // min(frames, n_frames)))
+        chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)] or [b""]
+        with atomic_writer(output_image_path) as fh:
+            writer = ApngWriter(fh, src.size, n_frames, src.info.get("loop", 0))
+            for index, frame in enumerate(ImageSequence.Iterator(src)):
+                rgb = frame.convert("RGB")
+                if index < len(chunks):
+                    embed_lsb_payload(rgb, length_prefixed(chunks[index]))
+                writer.add_frame(rgb, frame.info.get("duration", 100))
+            writer.finish()
+
+
+def animation_frame_count(image_path: Path) -> int:
+    if Image is None:
+        return 1
+    try:
+        with Image.open(image_path) as im:
+            return int(getattr(im, "n_frames", 1))
+    except Exception:
+        return 1
+
+
+def is_animated_image(image_path: Path) -> bool:
+    if Image is None:
+        return False
+    try:
+        with Image.open(image_path) as im:
+            return bool(getattr(im, "is_animated", False))
+    except Exception:
+        return False
+
+
+class ApngWriter:
+    """Streams equally sized RGB frames into an animated PNG file"""
+
+    SIGNATURE = b"\x89PNG\r\n\x1a\n"
+    MAX_CHUNK = 1 << 16
+
+    def __init__(self, fh, size: Tuple[int, int], num_frames: int, loop: int = 0):
+        self.fh = fh
+        self.width, self.height = size
+        self.num_frames = num_frames
+        self.frames_written = 0
+        self.sequence = 0
+        fh.write(self.SIGNATURE)
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0))
+        self._chunk(b"acTL", struct.pack(">II", num_frames, loop))
+
+    def add_frame(self, img: "Image.Image", duration_ms: int) -> None:
+        if self.frames_written >= self.num_frames:
+            raise ValueError("More frames than announced in acTL")
+        # Browsers play GIF delays of 10ms or less at 100ms; keep the same timing.
+        delay = int(duration_ms) if duration_ms and duration_ms > 10 else 100
+        self._chunk(
+            b"fcTL",
+            struct.pack(">IIIIIHHBB", self._next_sequence(), self.width, self.height, 0, 0, min(delay, 0xFFFF), 1000, 0, 0),
+        )
+
+        # Filter type 0 on every scanline, compressed incrementally.
+        raw = img.tobytes()
+        stride = self.width * 3
+        compressor = zlib.compressobj(9)
+        pending = bytearray()
+        for offset in range(0, len(raw), stride):
+            pending += compressor.compress(b"\x00" + raw[offset:offset + stride])
+            if len(pending) >= self.MAX_CHUNK:
+                self._frame_data(bytes(pending))
+                pending.clear()
+        pending += compressor.flush()
+        self._frame_data(bytes(pending))
+        self.frames_written += 1
+
+    def finish(self) -> None:
+        if self.frames_written != self.num_frames:
+            raise ValueError(f"Wrote {self.frames_written} frames, announced {self.num_frames}")
+        self._chunk(b"IEND", b"")
+
+    def _frame_data(self, data: bytes) -> None:
+        if self.frames_written == 0:
+            self._chunk(b"IDAT", data)
+        else:
+            self._chunk(b"fdAT", struct.pack(">I", self._next_sequence()) + data)
+
+    def _next_sequence(self) -> int:
+        number = self.sequence
+        self.sequence += 1
+        return number
+
+    def _chunk(self, kind: bytes, data: bytes) -> None:
+        self.fh.write(struct.pack(">I", len(data)) + kind + data)
+        self.fh.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+def lsb_payload(message: str) -> bytes:
+    return length_prefixed(message.encode("utf-8"))
+
+
+def length_prefixed(data: bytes) -> bytes:
+    return len(data).to_bytes(4, byteorder="big") + data
+
+
+def embed_lsb_payload(img: "Image.Image", payload: bytes) -> None:
+    """
+    Write payload bits, MSB first, into the LSBs of consecutive RGB channel
+    values of an RGB image, in place. Only the leading rows that hold the
+    payload are read back and patched.
+    """
+    width, height = img.size
     capacity_bits = width * height * 3
-    if len(bits) > capacity_bits:
+    needed_bits = len(payload) * 8
+    if needed_bits > capacity_bits:
         raise ValueError(
-            f"Message too large to embed. Available bits: {capacity_bits}, needed: {len(bits)}"
+            f"Message too large to embed. Available bits: {capacity_bits}, needed: {needed_bits}"
         )
 
-    # Embed bits across pixels' RGB LSBs
-    bit_i = 0
-    new_pixels = []
-    for (r, g, b) in pixels:
-        if bit_i < len(bits):
-            r = (r & 0xFE) | bits[bit_i]
-            bit_i += 1
-        if bit_i < len(bits):
-            g = (g & 0xFE) | bits[bit_i]
-            bit_i += 1
-        if bit_i < len(bits):
-            b = (b & 0xFE) | bits[bit_i]
-            bit_i += 1
-        new_pixels.append((r, g, b))
-
-    stego = Image.new("RGB", (width, height))
-    stego.putdata(new_pixels)
-    output_image_path.parent.mkdir(parents=True, exist_ok=True)
-    stego.save(output_image_path, format="PNG", optimize=True)
+    rows = -(-needed_bits // (width * 3))
+    band = bytearray(img.crop((0, 0, width, rows)).tobytes())
+    i = 0
+    for byte in payload:
+        for bit_idx in range(7, -1, -1):
+            band[i] = (band[i] & 0xFE) | ((byte >> bit_idx) & 1)
+            i += 1
+    img.paste(Image.frombytes("RGB", (width, rows), bytes(band)), (0, 0))
 
 
 def derive_stego_name(original_filename: str) -> str:
@@ -490,19 +1173,34 @@ def derive_stego_name(original_filename: str) -> str:
     return f"{stem}_stego.png"
 
 
-def generate_html(title: str, media_filename: str, media_kind: str, target_url: str, mode: str) -> str:
+def derive_fanout_name(original_filename: str, index: int) -> str:
+    stem = Path(original_filename).stem
+    return f"{stem}_stego_{index:04d}.png"
+
+
+def generate_html(title: str, media_filename: str, media_kind: str, target_url: str, mode: str, media_size: Optional[Tuple[int, int]] = None, warm: str = "off", video_preload: str = "metadata") -> str:
     # Minimal page that shows ONLY the clickable media. No headers, no footer.
     # mode == redirect: clicking media opens target_url in new tab
     # mode == embed: clicking media toggles an iframe showing target_url (hidden until clicked)
+    # warm == hover/pointerdown (embed only): start loading the hidden iframe on that event
+    if warm not in WARM_CHOICES:
+        raise ValueError(f"warm must be one of {', '.join(WARM_CHOICES)}")
+    if video_preload not in VIDEO_PRELOAD_CHOICES:
+        raise ValueError(f"video_preload must be one of {', '.join(VIDEO_PRELOAD_CHOICES)}")
     escaped_title = html_escape(title)
     escaped_target = html_escape(target_url)
+    resource_hints = generate_resource_hints(target_url, mode)
+    # Intrinsic width/height let the browser reserve the box before the media
+    # loads. The #media rule must leave width alone (no width: auto) for the
+    # attribute to count; object-fit keeps the ratio when max-height clamps it.
+    size_attrs = f' width="{media_size[0]}" height="{media_size[1]}"' if media_size else ""
     media_tag = ""
     if media_kind == "image":
-        media_tag = f'<img id="media" src="{media_filename}" alt="media" />'
+        media_tag = f'<img id="media" src="{media_filename}"{size_attrs} alt="media" fetchpriority="high" />'
     else:
         # Autoplay is off. Controls shown; click behavior handled by JS.
         media_tag = (
-            f'<video id="media" src="{media_filename}" controls preload="metadata"></video>'
+            f'<video id="media" src="{media_filename}" controls preload="{video_preload}" fetchpriority="high"></video>'
         )
 
     embed_block = (
@@ -521,14 +1219,27 @@ def generate_html(title: str, media_filename: str, media_kind: str, target_url:
           (function() {{
             const mode = {mode!r};
             const target = {escaped_target!r};
+            const warm = {warm!r};
             const media = document.getElementById('media');
             const embedContainer = document.getElementById('embedContainer');
             const embedFrame = document.getElementById('embedFrame');
+            let frameLoaded = false;
 
             function openInNewTab(url) {{
               window.open(url, '_blank', 'noopener,noreferrer');
             }}
 
+            function loadFrame() {{
+              if (frameLoaded) return;
+              embedFrame.loading = 'eager';
+              embedFrame.src = target;
+              frameLoaded = true;
+            }}
+
+            if (mode === 'embed' && warm !== 'off') {{
+              media.addEventListener(warm === 'hover' ? 'pointerenter' : 'pointerdown', loadFrame);
+            }}
+
             media.addEventListener('click', function() {{
               if (mode === 'redirect') {{
                 openInNewTab(target);
@@ -536,11 +1247,12 @@ def generate_html(title: str, media_filename: str, media_kind: str, target_url:
               }}
               if (mode === 'embed') {{
                 if (embedContainer.classList.contains('hidden')) {{
-                  embedFrame.src = target;
+                  loadFrame();
                   embedContainer.classList.remove('hidden');
                   embedContainer.scrollIntoView({{ behavior: 'smooth', block: 'start' }});
                 }} else {{
                   embedFrame.src = '';
+                  frameLoaded = false;
                   embedContainer.classList.add('hidden');
                 }}
               }}
@@ -563,8 +1275,8 @@ def generate_html(title: str, media_filename: str, media_kind: str, target_url:
       #media {
         max-width: 100vw;
         max-height: 100dvh;
-        width: auto;
         height: auto;
+        object-fit: contain;
         cursor: pointer;
         display: block;
       }
@@ -580,6 +1292,7 @@ def generate_html(title: str, media_filename: str, media_kind: str, target_url:
       <meta charset="utf-8" />
       <meta name="viewport" content="width=device-width, initial-scale=1" />
       <meta name="referrer" content="no-referrer" />
+      {resource_hints}
       <title>{escaped_title}</title>
       <style>{styles}</style>
     </head>
@@ -593,6 +1306,27 @@ def generate_html(title: str, media_filename: str, media_kind: str, target_url:
     return html
 
 
+def generate_resource_hints(target_url: str, mode: str) -> str:
+    # dns-prefetch helps in both modes: the DNS cache is shared with the new tab.
+    # A preconnected socket is only reused by the embedded iframe, because
+    # browsers partition connection pools by top-level site.
+    parts = urllib.parse.urlsplit(target_url)
+    # Build the origin from host and port only: netloc may carry user:password.
+    try:
+        host, port = parts.hostname, parts.port
+    except ValueError:
+        return ""
+    if parts.scheme not in ("http", "https") or not host:
+        return ""
+    if ":" in host:
+        host = f"[{host}]"
+    origin = html_escape(f"{parts.scheme}://{host}" + (f":{port}" if port is not None else ""))
+    hints = [f'<link rel="dns-prefetch" href="{origin}" />']
+    if mode == "embed":
+        hints.insert(0, f'<link rel="preconnect" href="{origin}" />')
+    return "\n      ".join(hints)
+
+
 def html_escape(text: str) -> str:
     return (
         text.replace("&", "&amp;")
@@ -603,6 +1337,227 @@ def html_escape(text: str) -> str:
     )
 
 
+MEMORY_PROFILE_CASES = (
+    "embed_lsb_message_into_image",
+    "embed_lsb_messages_fanout",
+    "generate_clickable_svg",
+    "generate_html",
+    "copy_media",
+    "write_file",
+)
+IMAGE_MEMORY_CASES = {"embed_lsb_message_into_image", "embed_lsb_messages_fanout", "generate_clickable_svg"}
+
+
+def positive_int(text: str) -> int:
+    # argparse type for counts that must be at least 1
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def parse_byte_size(text: str) -> int:
+    # "512K", "4M", "1G" or a plain byte count
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    number = text.strip().upper()
+    scale = units.get(number[-1:], 1)
+    if scale != 1:
+        number = number[:-1]
+    try:
+        value = int(float(number) * scale)
+    except (ValueError, OverflowError):
+        raise ValueError(f"invalid size '{text.strip()}' (use a byte count or a K/M/G suffix)") from None
+    if value < 1:
+        raise ValueError(f"size must be at least 1 byte, got '{text.strip()}'")
+    return value
+
+
+def profile_memory(sizes: list[int], budget: float, cases: Optional[list[str]] = None, rss_budget: Optional[float] = None) -> list[dict]:
+    """
+    Run each public entry point on synthetic inputs of the given sizes and
+    record its tracemalloc peak and its RSS peak above the post-warm-up
+    baseline. Every case runs in a fresh spawned process so earlier cases
+    cannot hide later ones. tracemalloc sees only Python allocations and RSS
+    also sees Pillow's pixel buffers, so each has its own budget (bytes per
+    input byte); rss_budget defaults to budget. A result fails when either is
+    exceeded. RSS is only measured where the peak can be reset (Linux).
+    """
+    cases = list(cases or MEMORY_PROFILE_CASES)
+    if Image is None:
+        cases = [case for case in cases if case not in IMAGE_MEMORY_CASES]
+    rss_budget = budget if rss_budget is None else rss_budget
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="stego_memprofile_") as tmp:
+        tmp_dir = Path(tmp)
+        ctx = multiprocessing.get_context("spawn")
+        for size in sizes:
+            inputs = _write_memory_inputs(tmp_dir / str(size), size)
+            for case in cases:
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    result = pool.submit(_measure_memory_case, case, inputs).result()
+                input_bytes = result["input_bytes"]
+                result["traced_per_input_byte"] = round(result["tracemalloc_peak"] / input_bytes, 3)
+                result["rss_per_input_byte"] = (
+                    None if result["rss_growth"] is None else round(result["rss_growth"] / input_bytes, 3)
+                )
+                result["budget"] = budget
+                result["rss_budget"] = rss_budget
+                result["ok"] = result["traced_per_input_byte"] <= budget and (
+                    result["rss_per_input_byte"] is None or result["rss_per_input_byte"] <= rss_budget
+                )
+                results.append(result)
+    return results
+
+
+def _write_memory_inputs(directory: Path, size: int) -> dict:
+    # Inputs are produced here, in the parent, so building them does not add
+    # to the measuring process's memory.
+    directory.mkdir(parents=True, exist_ok=True)
+    inputs = {"dir": str(directory), "size": size}
+    blob = directory / "blob.bin"
+    blob.write_bytes(os.urandom(size))
+    inputs["blob"] = str(blob)
+    if Image is not None:
+        # Noise barely compresses, so the PNG is about as large as its pixels.
+        side = max(8, int((size / 3) ** 0.5))
+        carrier = directory / "carrier.png"
+        Image.frombytes("RGB", (side, side), os.urandom(side * side * 3)).save(carrier, format="PNG")
+        inputs["carrier"] = str(carrier)
+    return inputs
+
+
+def _measure_memory_case(case: str, inputs: dict) -> dict:
+    directory = Path(inputs["dir"]) / case
+    url = "https://example.com/campaign?id=0123456789"
+    text = "x" * inputs["size"]
+
+    # Each run writes into its own empty directory, so later runs take the
+    # same write path as the first instead of the unchanged-file shortcut.
+    if case == "embed_lsb_message_into_image":
+        input_path = Path(inputs["carrier"])
+        run = lambda out: embed_lsb_message_into_image(input_path, url, out / "out.png")
+    elif case == "embed_lsb_messages_fanout":
+        input_path = Path(inputs["carrier"])
+        run = lambda out: embed_lsb_messages_fanout(
+            input_path, [f"{url}&v={i}" for i in range(4)], [out / f"out_{i}.png" for i in range(4)], 2
+        )
+    elif case == "generate_clickable_svg":
+        input_path = Path(inputs["carrier"])
+        run = lambda out: generate_clickable_svg(input_path, url)
+    elif case == "generate_html":
+        input_path = None
+        run = lambda out: generate_html(text, "media.png", "image", url, "embed")
+    elif case == "copy_media":
+        input_path = Path(inputs["blob"])
+        run = lambda out: copy_media(input_path, out)
+    elif case == "write_file":
+        input_path = None
+        run = lambda out: write_file(out / "out.txt", text)
+    else:
+        raise ValueError(f"Unknown memory profile case: {case}")
+    input_bytes = input_path.stat().st_size if input_path else len(text)
+
+    # Warm-up: lazy imports, Pillow plugin registration and first-use caches
+    # should not count against the function.
+    run(directory / "warmup")
+    gc.collect()
+    _release_free_memory()
+
+    # RSS pass, without tracemalloc's own bookkeeping in the way.
+    rss_growth = None
+    if _reset_peak_rss():
+        baseline = _current_rss_bytes()
+        start = time.perf_counter()
+        run(directory / "rss")
+        elapsed = time.perf_counter() - start
+        rss_growth = max(0, _peak_rss_bytes() - baseline)
+    else:
+        start = time.perf_counter()
+        run(directory / "timing")
+        elapsed = time.perf_counter() - start
+
+    # tracemalloc pass
+    tracemalloc.start()
+    run(directory / "traced")
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "case": case,
+        "input_bytes": input_bytes,
+        "tracemalloc_peak": traced_peak,
+        "rss_growth": rss_growth,
+        "seconds": round(elapsed, 4),
+    }
+
+
+# Pillow allocates pixel storage with plain malloc, which tracemalloc cannot
+# see, so RSS is what catches extra decoded-image copies. The helpers below
+# use Linux /proc; elsewhere the RSS check is skipped rather than guessed.
+
+def _reset_peak_rss() -> bool:
+    # Writing 5 to clear_refs resets this process's VmHWM to its current RSS.
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _current_rss_bytes() -> int:
+    with open("/proc/self/statm") as fh:
+        return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _peak_rss_bytes() -> int:
+    with open("/proc/self/status") as fh:
+        for line in fh:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def _release_free_memory() -> None:
+    # Hand freed heap pages back to the OS so they are not in the baseline.
+    try:
+        import ctypes
+
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def run_memprofile(sizes_text: str, budget: float, cases_text: Optional[str] = None, rss_budget: Optional[float] = None) -> int:
+    """Print memory profile results as JSON; non-zero when any case breaks a budget"""
+    try:
+        sizes = [parse_byte_size(part) for part in sizes_text.split(",") if part.strip()]
+    except ValueError as exc:
+        print(f"{Colors.RED}❌ Error: --mem-sizes: {exc}{Colors.END}", file=sys.stderr)
+        return 2
+    if not sizes:
+        print(f"{Colors.RED}❌ Error: --mem-sizes needs at least one size{Colors.END}", file=sys.stderr)
+        return 2
+    cases = [part.strip() for part in cases_text.split(",") if part.strip()] if cases_text else None
+    unknown = sorted(set(cases or []) - set(MEMORY_PROFILE_CASES))
+    if unknown:
+        print(f"{Colors.RED}❌ Error: unknown memory profile case(s): {', '.join(unknown)}{Colors.END}", file=sys.stderr)
+        return 2
+
+    results = profile_memory(sizes, budget, cases, rss_budget)
+    print(json.dumps(results, indent=2))
+    failed = [r for r in results if not r["ok"]]
+    for r in failed:
+        print(
+            f"{Colors.RED}❌ {r['case']} on {r['input_bytes']} input bytes used {r['traced_per_input_byte']} "
+            f"(tracemalloc, budget {r['budget']}) and {r['rss_per_input_byte']} (RSS, budget {r['rss_budget']}) "
+            f"bytes per input byte{Colors.END}",
+            file=sys.stderr,
+        )
+    return 1 if failed else 0
+
+
 def main(argv: list[str]) -> int:
     parser = argparse.ArgumentParser(description="Generate clickable media output redirecting to or embedding a target URL.")
     parser.add_argument("--media", help="Path to image or video file")
@@ -612,13 +1567,73 @@ def main(argv: list[str]) -> int:
     parser.add_argument("--out", default="./Stegno_Templates", help="Output directory for generated files")
     parser.add_argument("--format", choices=["html", "markdown", "svg"], default="html", help="Output format: html (index.html), markdown (README_snippet.md), svg (single clickable image)")
     parser.add_argument("--stego", action="store_true", help="Embed the URL into the image using LSB steganography (outputs *_stego.png)")
+    parser.add_argument("--fingerprint", action="store_true", help="Name media, stego and SVG outputs <stem>.<hash>.<ext> and write asset-manifest.json plus a _headers file marking them immutable")
+    parser.add_argument("--animated", action="store_true", help="With --stego, keep animated GIF/WebP carriers animated by writing an animated PNG instead of flattening to the first frame")
+    parser.add_argument("--frames", type=positive_int, default=1, help="With --animated, spread the hidden URL over this many leading frames (default: 1)")
+    parser.add_argument("--warm", choices=WARM_CHOICES, default="off", help="Embed mode: start loading the hidden iframe on hover or pointerdown instead of on click (default: off)")
+    parser.add_argument("--video-preload", choices=VIDEO_PRELOAD_CHOICES, default="metadata", help="preload strategy for video media (default: metadata)")
+    parser.add_argument("--fanout", metavar="URLS_FILE", help="Embed each URL in URLS_FILE (one per line) into its own stego copy of --media, decoding the carrier once")
+    parser.add_argument("--workers", type=positive_int, default=None, help="Worker threads used to encode --fanout variants (default: CPU based)")
     parser.add_argument("--serve", action="store_true", help="After generating, serve the output directory over HTTP")
     parser.add_argument("--host", default="0.0.0.0", help="Host/interface to bind when serving (default: 0.0.0.0)")
     parser.add_argument("--port", type=int, default=8080, help="Port to serve on when --serve is used (default: 8080)")
+    parser.add_argument("--memprofile", action="store_true", help="Profile peak memory of each public function on synthetic inputs and fail when --mem-budget is exceeded")
+    parser.add_argument("--mem-sizes", default="256K,1M,4M", help="Comma-separated synthetic input sizes for --memprofile (default: 256K,1M,4M)")
+    parser.add_argument("--mem-budget", type=float, default=DEFAULT_MEMORY_BUDGET, help=f"Allowed tracemalloc peak bytes per input byte for --memprofile (default: {DEFAULT_MEMORY_BUDGET})")
+    parser.add_argument("--rss-budget", type=float, default=DEFAULT_RSS_BUDGET, help=f"Allowed RSS growth bytes per input byte for --memprofile, Linux only (default: {DEFAULT_RSS_BUDGET})")
+    parser.add_argument("--mem-cases", default=None, help="Comma-separated subset of functions to profile (default: all)")
+    parser.add_argument("--batch", metavar="JOBS_FILE", help="Run every JSON job spec in JOBS_FILE (one per line) through a pipelined build; jobs without \"out\" write to --out/<id>")
+    parser.add_argument("--io-threads", type=positive_int, default=4, help="With --batch, threads for each of the copy and write stages (default: 4)")
+    parser.add_argument("--cpu-workers", type=positive_int, default=None, help="With --batch, processes for the decode/embed/encode stage (default: CPU count)")
+    parser.add_argument("--queue-depth", type=positive_int, default=8, help="With --batch, jobs buffered between stages and encoding at once (default: 8)")
+    parser.add_argument("--resume", action="store_true", help="With --batch, skip jobs the journal records as finished and retry failed or unfinished ones")
+    parser.add_argument("--journal", default=None, help="With --batch, checkpoint journal path (default: --out/.stego_journal.jsonl)")
+    parser.add_argument("--daemon", action="store_true", help="Read JSON job specs line by line and write one JSON result per line, keeping caches warm between jobs")
+    parser.add_argument("--socket", default=None, help="With --daemon, accept jobs on this Unix socket instead of stdin/stdout")
+    parser.add_argument("--cache-mb", type=int, default=256, help="With --daemon, memory budget for decoded carrier images in MB (default: 256)")
+    parser.add_argument("--threaded", action="store_true", help="Serve each connection on its own thread (--serve and the local --loadtest server)")
+    parser.add_argument("--loadtest", action="store_true", help="Load-test the files in --out and print RPS, latency percentiles, errors and bytes/sec as JSON")
+    parser.add_argument("--loadtest-url", default=None, help="With --loadtest, target this running server (http[s]://host[:port][/prefix]) instead of starting a local one")
+    parser.add_argument("--mix", default=None, help="With --loadtest, request weights per kind, e.g. html=4,png=3,svg=2,video=1 (the default)")
+    parser.add_argument("--concurrency", type=int, default=8, help="With --loadtest, number of concurrent clients (default: 8)")
+    parser.add_argument("--requests", type=int, default=1000, help="With --loadtest, total requests to send (default: 1000)")
+    parser.add_argument("--duration", type=float, default=None, help="With --loadtest, run for this many seconds instead of a fixed request count")
     parser.add_argument("--interactive", "-i", action="store_true", help="Run in interactive mode with menu")
     args = parser.parse_args(argv)
     
+    if args.memprofile:
+        return run_memprofile(args.mem_sizes, args.mem_budget, args.mem_cases, args.rss_budget)
+
+    if args.batch:
+        return run_batch(
+            Path(args.batch).expanduser().resolve(), Path(args.out).expanduser().resolve(),
+            args.io_threads, args.cpu_workers, args.queue_depth, args.resume,
+            Path(args.journal).expanduser().resolve() if args.journal else None,
+        )
+
+    if args.daemon:
+        return run_daemon(args.socket, args.cache_mb * 1024 * 1024)
+
+    if args.loadtest:
+        return run_loadtest(
+            Path(args.out).expanduser().resolve(), args.loadtest_url, args.mix,
+            args.concurrency, args.requests, args.duration, args.threaded,
+        )
+
     # If no arguments provided or interactive mode requested, run interactive mode
+    if args.fanout and not args.interactive:
+        if not args.media:
+            print(f"{Colors.RED}❌ Error: --media is required with --fanout{Colors.END}")
+            return 2
+        if args.url:
+            print(f"{Colors.YELLOW}💡 --url is ignored with --fanout; URLs come from {args.fanout}{Colors.END}")
+        media_path = Path(args.media).expanduser().resolve()
+        out_dir = Path(args.out).expanduser().resolve()
+        result = run_fanout(media_path, Path(args.fanout).expanduser().resolve(), out_dir, args.workers)
+        if result == 0 and args.serve:
+            return serve_directory(out_dir, args.host, args.port, args.threaded)
+        return result
+
     if not any([args.media, args.url]) or args.interactive:
         interactive_mode()
         return 0
@@ -639,7 +1654,7 @@ def main(argv: list[str]) -> int:
         out_dir = Path(os.path.join(os.getcwd(), args.out)).resolve()
     else:
         out_dir = Path(args.out).expanduser().resolve()
-    error = validate_inputs(media_path, args.url, args.mode)
+    error = validate_inputs(media_path, args.url, args.mode, args.stego, args.frames if args.animated else 1)
     if error:
         print(f"{Colors.RED}❌ Error: {error}{Colors.END}")
         return 2
@@ -651,40 +1666,33 @@ def main(argv: list[str]) -> int:
     else:
         print(f"{Colors.BLUE}📁 Using existing directory: {out_dir}{Colors.END}")
 
-    # Copy media to output directory
-    media_filename = copy_media(media_path, out_dir)
-    media_kind = "image" if media_path.suffix.lower() in IMAGE_EXTS else "video"
+    try:
+        outputs = build_outputs(
+            media_path, args.url, args.mode, out_dir, args.title, args.format, args.stego, args.fingerprint,
+            args.animated, args.frames, args.warm, args.video_preload,
+        )
+    except Exception as exc:  # pragma: no cover
+        print(f"{Colors.RED}❌ Error: {exc}{Colors.END}")
+        return 2
 
-    # Optionally embed the URL invisibly into a PNG
-    stego_filename: Optional[str] = None
-    if args.stego and media_kind == "image":
-        try:
-            stego_filename = derive_stego_name(media_filename)
-            embed_lsb_message_into_image(out_dir / media_filename, args.url, out_dir / stego_filename)
-            print(f"{Colors.GREEN}🔐 Embedded hidden URL into: {out_dir / stego_filename}{Colors.END}")
-        except Exception as exc:  # pragma: no cover
-            print(f"{Colors.RED}❌ Error embedding stego message: {exc}{Colors.END}")
-            return 2
+    stego_filename = outputs["stego"]
+    if stego_filename:
+        print(f"{Colors.GREEN}🔐 Embedded hidden URL into: {out_dir / stego_filename}{Colors.END}")
+    if args.fingerprint:
+        print(f"{Colors.GREEN}🧾 Cache manifest updated: {out_dir / 'asset-manifest.json'} and {out_dir / '_headers'}{Colors.END}")
 
     if args.format == "markdown":
-        # Produce a Markdown snippet that makes the image clickable to the URL.
-        md_image = stego_filename or media_filename
-        snippet = f"[![clickable media]({md_image})]({args.url})\n"
-        write_file(out_dir / "README_snippet.md", snippet)
+        # Markdown snippet that makes the image clickable to the URL.
         print(f"\n{Colors.GREEN}✅ Done. Markdown snippet created:{Colors.END}")
-        print(f"  {out_dir / 'README_snippet.md'}")
+        print(f"  {out_dir / outputs['output']}")
         print(f"\n{Colors.YELLOW}💡 Use this in your README.md on GitHub to make the image clickable.{Colors.END}")
         if args.serve:
-            return serve_directory(out_dir, args.host, args.port)
+            return serve_directory(out_dir, args.host, args.port, args.threaded)
         return 0
 
     if args.format == "svg":
-        # Create a standalone SVG that, when clicked, opens the URL
-        svg_source = out_dir / (stego_filename or media_filename)
-        svg_content = generate_clickable_svg(svg_source, args.url)
-        svg_name = f"{Path(svg_source).stem}.svg"
-        svg_path = out_dir / svg_name
-        write_file(svg_path, svg_content)
+        # Standalone SVG that, when clicked, opens the URL
+        svg_path = out_dir / outputs["output"]
         print(f"\n{Colors.GREEN}✅ Done. Clickable SVG image created:{Colors.END}")
         print(f"  {svg_path}")
         if stego_filename:
@@ -695,26 +1703,14 @@ def main(argv: list[str]) -> int:
         else:
             print(f"\n{Colors.YELLOW}💡 Tip: Use --stego to also embed the URL invisibly into a PNG next to the SVG.{Colors.END}")
         if args.serve:
-            return serve_directory(out_dir, args.host, args.port)
+            return serve_directory(out_dir, args.host, args.port, args.threaded)
         return 0
 
     # Default: HTML output
-    html = generate_html(
-        title=args.title,
-        media_filename=media_filename,
-        media_kind=media_kind,
-        target_url=args.url,
-        mode=args.mode,
-    )
-    write_file(out_dir / "index.html", html)
-
-    # Write a .nojekyll to make GitHub Pages serve files as-is
-    write_file(out_dir / ".nojekyll", "")
-
     print(f"\n{Colors.GREEN}✅ Done. Static page created:{Colors.END}")
-    print(f"  {out_dir / 'index.html'}")
+    print(f"  {out_dir / outputs['output']}")
     if args.serve:
-        return serve_directory(out_dir, args.host, args.port)
+        return serve_directory(out_dir, args.host, args.port, args.threaded)
     else:
         print(f"\n{Colors.BLUE}🌐 Preview locally:{Colors.END}")
         print(f"  python -m http.server --directory {out_dir} 8080")
@@ -722,9 +1718,805 @@ def main(argv: list[str]) -> int:
         return 0
 
 
-def serve_directory(directory: Path, host: str, port: int) -> int:
-    handler_cls = partial(http.server.SimpleHTTPRequestHandler, directory=str(directory))
-    with socketserver.TCPServer((host, port), handler_cls) as httpd:
+# Relative weight of each request kind in a load test.
+DEFAULT_LOADTEST_MIX = {"html": 4, "png": 3, "svg": 2, "video": 1}
+LOADTEST_RANGE_BYTES = 1 << 20
+
+
+def discover_loadtest_targets(directory: Path) -> dict:
+    """Group the files under directory by load-test kind: {kind: [(url path, size), ...]}"""
+    targets: dict = {kind: [] for kind in DEFAULT_LOADTEST_MIX}
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or path.name.startswith("."):
+            continue
+        ext = path.suffix.lower()
+        if ext == ".html":
+            kind = "html"
+        elif ext == ".png":
+            kind = "png"
+        elif ext == ".svg":
+            kind = "svg"
+        elif ext in VIDEO_EXTS:
+            kind = "video"
+        else:
+            continue
+        url_path = "/" + urllib.parse.quote(path.relative_to(directory).as_posix())
+        targets[kind].append((url_path, path.stat().st_size))
+    return targets
+
+
+def run_load(host: str, port: int, targets: dict, mix: dict, concurrency: int, total_requests: int, duration: Optional[float] = None, seed: int = 0, scheme: str = "http", base_path: str = "") -> dict:
+    """
+    Replay a weighted request mix against scheme://host:port/base_path from `concurrency`
+    keep-alive client threads until total_requests are sent (or, if given,
+    until duration seconds pass). Video requests ask for a random 1 MiB range;
+    a 200 reply to one sent the whole file and counts as range_ignored (and
+    as an error) rather than as throughput.
+    Returns throughput, latency percentiles, error and byte counts.
+    """
+    kinds = [kind for kind in mix if mix[kind] > 0 and targets.get(kind)]
+    if not kinds:
+        raise ValueError("Nothing to request: no files match the requested mix")
+    weights = [mix[kind] for kind in kinds]
+
+    lock = threading.Lock()
+    issued = [0]
+    samples: list = []  # (kind, seconds, status or None, bytes, ranged)
+    deadline = time.perf_counter() + duration if duration else None
+
+    def take_ticket() -> bool:
+        with lock:
+            if deadline is None and issued[0] >= total_requests:
+                return False
+            issued[0] += 1
+            return True
+
+    def worker(worker_id: int) -> None:
+        rng = random.Random(seed * 1000 + worker_id)
+        connection_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = connection_cls(host, port, timeout=30)
+        local = []
+        while (deadline is None or time.perf_counter() < deadline) and take_ticket():
+            kind = rng.choices(kinds, weights)[0]
+            url_path, size = rng.choice(targets[kind])
+            headers = {}
+            if kind == "video" and size > 0:
+                first = rng.randrange(0, max(1, size - LOADTEST_RANGE_BYTES))
+                headers["Range"] = f"bytes={first}-{min(size, first + LOADTEST_RANGE_BYTES) - 1}"
+            start = time.perf_counter()
+            try:
+                conn.request("GET", base_path + url_path, headers=headers)
+                response = conn.getresponse()
+                received = 0
+                for chunk in iter(partial(response.read, 1 << 16), b""):
+                    received += len(chunk)
+                local.append((kind, time.perf_counter() - start, response.status, received, bool(headers)))
+            except (OSError, http.client.HTTPException):
+                local.append((kind, time.perf_counter() - start, None, 0, bool(headers)))
+                conn.close()
+        conn.close()
+        with lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    def summarize(rows: list) -> dict:
+        latencies = sorted(row[1] for row in rows)
+        # A 200 to a Range request sent the whole file: not the requested work.
+        ignored = [row for row in rows if row[4] and row[2] == 200]
+        errors = sum(1 for row in rows if row[2] is None or row[2] >= 400) + len(ignored)
+        received = sum(row[3] for row in rows) - sum(row[3] for row in ignored)
+        return {
+            "requests": len(rows),
+            "errors": errors,
+            "range_ignored": len(ignored),
+            "bytes": received,
+            "latency_ms": {
+                "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else None,
+                "p50": _percentile_ms(latencies, 50),
+                "p90": _percentile_ms(latencies, 90),
+                "p99": _percentile_ms(latencies, 99),
+                "max": _percentile_ms(latencies, 100),
+            },
+        }
+
+    overall = summarize(samples)
+    report = {
+        "target": f"{scheme}://{host}:{port}{base_path}",
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "rps": round(len(samples) / elapsed, 2) if elapsed else None,
+        "bytes_per_sec": round(overall["bytes"] / elapsed, 1) if elapsed else None,
+        **overall,
+        "status_codes": {},
+        "by_kind": {kind: summarize([row for row in samples if row[0] == kind]) for kind in kinds},
+    }
+    for row in samples:
+        code = str(row[2]) if row[2] is not None else "connection_error"
+        report["status_codes"][code] = report["status_codes"].get(code, 0) + 1
+    return report
+
+
+def _percentile_ms(sorted_seconds: list, pct: float) -> Optional[float]:
+    # Nearest-rank percentile
+    if not sorted_seconds:
+        return None
+    rank = max(1, -(-len(sorted_seconds) * pct // 100))
+    return round(sorted_seconds[int(rank) - 1] * 1000, 3)
+
+
+def parse_loadtest_mix(text: str) -> dict:
+    # "html=4,png=3,svg=2,video=1"
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in DEFAULT_LOADTEST_MIX:
+            raise ValueError(f"Unknown request kind '{kind}'. Choose from: {', '.join(DEFAULT_LOADTEST_MIX)}")
+        mix[kind] = float(weight) if weight else 1.0
+    return mix
+
+
+def parse_loadtest_target(url: str) -> Tuple[str, str, int, str]:
+    """
+    Split an http(s)://host[:port][/prefix] load-test target into (scheme,
+    host, port, path prefix). The prefix, without its trailing slash, is put
+    in front of every requested file. Raises ValueError for anything else.
+    """
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme not in ("http", "https"):
+        raise ValueError(f"expected an http:// or https:// URL, got '{url}'")
+    try:
+        port = parsed.port
+    except ValueError:
+        raise ValueError(f"invalid port in '{url}'") from None
+    if not parsed.hostname:
+        raise ValueError(f"no host in '{url}'")
+    if parsed.username is not None or parsed.query or parsed.fragment:
+        raise ValueError(f"credentials, query strings and fragments are not supported: '{url}'")
+    if port is None:
+        port = 443 if parsed.scheme == "https" else 80
+    return parsed.scheme, parsed.hostname, port, parsed.path.rstrip("/")
+
+
+def _serve_for_loadtest(directory: str, host: str, threaded: bool, conn) -> None:
+    # Runs in a child process so client threads do not share the server's GIL.
+    with make_server(Path(directory), host, 0, threaded, quiet=True) as httpd:
+        conn.send(httpd.server_address[1])
+        httpd.serve_forever()
+
+
+def run_loadtest(directory: Path, target: Optional[str], mix_text: Optional[str], concurrency: int, total_requests: int, duration: Optional[float], threaded: bool, host: str = "127.0.0.1") -> int:
+    """
+    Load-test the files in directory: against `target` (see
+    parse_loadtest_target) if given, otherwise against a freshly started local
+    server. Prints a JSON report.
+    """
+    if not directory.is_dir():
+        print(f"{Colors.RED}❌ Error: Output directory does not exist: {directory}{Colors.END}", file=sys.stderr)
+        return 2
+    try:
+        mix = parse_loadtest_mix(mix_text) if mix_text else dict(DEFAULT_LOADTEST_MIX)
+    except ValueError as exc:
+        print(f"{Colors.RED}❌ Error: {exc}{Colors.END}", file=sys.stderr)
+        return 2
+    scheme, base_path = "http", ""
+    if target:
+        try:
+            scheme, host, port, base_path = parse_loadtest_target(target)
+        except ValueError as exc:
+            print(f"{Colors.RED}❌ Error: --loadtest-url: {exc}{Colors.END}", file=sys.stderr)
+            return 2
+    targets = discover_loadtest_targets(directory)
+
+    server_process = None
+    if not target:
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        server_process = ctx.Process(target=_serve_for_loadtest, args=(str(directory), host, threaded, child_conn), daemon=True)
+        server_process.start()
+        # Close our copy of the child's end, so recv() sees EOF if the server dies.
+        child_conn.close()
+        try:
+            port = parent_conn.recv()
+        except EOFError:
+            server_process.join()
+            print(f"{Colors.RED}❌ Error: Local server exited before it started listening{Colors.END}", file=sys.stderr)
+            return 2
+
+    try:
+        report = run_load(host, port, targets, mix, concurrency, total_requests, duration, scheme=scheme, base_path=base_path)
+    except ValueError as exc:
+        print(f"{Colors.RED}❌ Error: {exc}{Colors.END}", file=sys.stderr)
+        return 2
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            server_process.join()
+    report["server"] = target or ("local threaded" if threaded else "local single-threaded")
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+JOB_DEFAULTS = {
+    "mode": "redirect",
+    "out": "./Stegno_Templates",
+    "title": "Clickable Media",
+    "format": "html",
+    "stego": False,
+    "fingerprint": False,
+    "animated": False,
+    "frames": 1,
+    "warm": "off",
+    "video_preload": "metadata",
+}
+
+
+def job_from_spec(spec: dict, default_out: Optional[Path] = None) -> dict:
+    """
+    Turn a JSON job spec (the command line options by name: media, url, mode,
+    out, title, format, stego, fingerprint, animated, frames, warm,
+    video_preload) into build_outputs keyword arguments, applying JOB_DEFAULTS
+    and resolving paths. default_out replaces the default output directory.
+    Raises ValueError for unusable specs.
+    """
+    opts = {**JOB_DEFAULTS, **spec}
+    if not opts.get("media") or not opts.get("url"):
+        raise ValueError("job needs 'media' and 'url'")
+    for key in ("media", "url", "mode", "out", "title", "warm", "video_preload"):
+        if not isinstance(opts[key], str):
+            raise ValueError(f"'{key}' must be a string")
+    for key in ("stego", "fingerprint", "animated"):
+        if not isinstance(opts[key], bool):
+            raise ValueError(f"'{key}' must be true or false")
+    if not isinstance(opts["frames"], int) or isinstance(opts["frames"], bool):
+        raise ValueError("'frames' must be an integer")
+    if opts["frames"] < 1:
+        raise ValueError("'frames' must be at least 1")
+    if opts["format"] not in {"html", "markdown", "svg"}:
+        raise ValueError("'format' must be one of html, markdown, svg")
+    if opts["mode"] not in {"redirect", "embed"}:
+        raise ValueError("'mode' must be one of redirect, embed")
+    if opts["warm"] not in WARM_CHOICES:
+        raise ValueError(f"'warm' must be one of {', '.join(WARM_CHOICES)}")
+    if opts["video_preload"] not in VIDEO_PRELOAD_CHOICES:
+        raise ValueError(f"'video_preload' must be one of {', '.join(VIDEO_PRELOAD_CHOICES)}")
+    out = Path(str(opts["out"])) if "out" in spec or default_out is None else default_out
+    return {
+        "media_path": Path(str(opts["media"])).expanduser().resolve(),
+        "url": str(opts["url"]),
+        "mode": str(opts["mode"]),
+        "out_dir": out.expanduser().resolve(),
+        "title": str(opts["title"]),
+        "format_type": opts["format"],
+        "stego": bool(opts["stego"]),
+        "fingerprint": bool(opts["fingerprint"]),
+        "animated": bool(opts["animated"]),
+        "frames": int(opts["frames"]),
+        "warm": str(opts["warm"]),
+        "video_preload": str(opts["video_preload"]),
+    }
+
+
+def run_job(spec: dict) -> dict:
+    """
+    Run one JSON job spec (see job_from_spec, plus an optional id) through
+    run_generation. Progress output goes to stderr; the returned dict
+    describes the outcome.
+    """
+    start = time.perf_counter()
+    outputs: dict = {}
+    out_dir = None
+    try:
+        job = job_from_spec(spec)
+        out_dir = job["out_dir"]
+        # stdout carries the JSON results, so progress messages go to stderr.
+        with contextlib.redirect_stdout(sys.stderr):
+            code = run_generation(serve=False, outputs=outputs, **job)
+    except Exception as exc:
+        code = 2
+        outputs["error"] = str(exc)
+        print(f"{Colors.RED}❌ Error: {exc}{Colors.END}", file=sys.stderr)
+
+    result = {"id": spec.get("id"), "ok": code == 0, "exit_code": code}
+    if code == 0:
+        result["out"] = str(out_dir)
+        result["outputs"] = outputs
+    else:
+        result["error"] = outputs.get("error") or "job failed"
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+
+def run_pipeline(jobs, on_result, io_threads: int = 4, cpu_workers: Optional[int] = None, queue_depth: int = 8) -> None:
+    """
+    Run many build_outputs jobs as a staged pipeline so disk and CPU overlap:
+
+        jobs -> [copy: io_threads threads] -> [encode: cpu_workers processes]
+             -> [write: io_threads threads] -> on_result
+
+    jobs yields (job_id, job) pairs where job holds build_outputs keyword
+    arguments, or (job_id, exception) for specs that could not be parsed.
+    Stages are joined by queues holding at most queue_depth jobs, and at most
+    queue_depth jobs are encoding at once, so memory stays bounded however
+    long the input. Decode, embed and encode share one process task: shipping
+    decoded pixels between processes would cost more than it overlaps.
+    on_result(result) is called from the writer threads, one call at a time,
+    with {"id", "ok", "out", "outputs" and "files" | "error", "elapsed_ms"};
+    "files" maps each written file name to its sha256 and size.
+    A failing job only fails itself. If a worker process dies (for example
+    killed for running out of memory) the jobs it took down are reported as
+    failed and later jobs go to a fresh process pool.
+    """
+    for name, value in (("io_threads", io_threads), ("cpu_workers", cpu_workers), ("queue_depth", queue_depth)):
+        if value is not None and value < 1:
+            raise ValueError(f"{name} must be at least 1, got {value}")
+
+    copy_queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+    encode_queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+    write_queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+    in_flight = threading.Semaphore(queue_depth)
+    result_lock = threading.Lock()
+    done = object()
+
+    def report(job_id, started: float, out_dir: Optional[Path], outputs: Optional[dict] = None, error: Optional[str] = None, files: Optional[dict] = None) -> None:
+        result = {"id": job_id, "ok": error is None}
+        if out_dir is not None:
+            result["out"] = str(out_dir)
+        if error is None:
+            result["outputs"] = outputs
+            result["files"] = files
+        else:
+            result["error"] = error
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        with result_lock:
+            on_result(result)
+
+    def copier() -> None:
+        while True:
+            item = copy_queue.get()
+            if item is done:
+                return
+            job_id, job, started = item
+            try:
+                error = validate_inputs(
+                    job["media_path"], job["url"], job["mode"], job["stego"], job["frames"] if job["animated"] else 1
+                )
+                if error:
+                    raise ValueError(error)
+                stage_copy(job)
+            except Exception as exc:
+                report(job_id, started, job["out_dir"], error=str(exc))
+                continue
+            (encode_queue if needs_encode(job) else write_queue).put(item)
+
+    def writer() -> None:
+        while True:
+            item = write_queue.get()
+            if item is done:
+                return
+            job_id, job, started = item
+            try:
+                outputs = stage_write(job)
+                files = {}
+                for name in sorted({name for name in outputs.values() if name}):
+                    path = job["out_dir"] / name
+                    stat = path.stat()
+                    files[name] = {"sha256": file_digest(path), "bytes": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            except Exception as exc:
+                report(job_id, started, job["out_dir"], error=str(exc))
+            else:
+                report(job_id, started, job["out_dir"], outputs, files=files)
+
+    def encoded(future, job_id, job: dict, started: float) -> None:
+        in_flight.release()
+        try:
+            write_queue.put((job_id, future.result(), started))
+        except BrokenProcessPool:
+            report(job_id, started, job["out_dir"], error="Encoder process exited unexpectedly (out of memory?)")
+        except Exception as exc:
+            report(job_id, started, job["out_dir"], error=str(exc))
+
+    copiers = [threading.Thread(target=copier, daemon=True) for _ in range(io_threads)]
+    writers = [threading.Thread(target=writer, daemon=True) for _ in range(io_threads)]
+    for thread in copiers + writers:
+        thread.start()
+
+    def feed() -> None:
+        started = time.perf_counter()
+        try:
+            for job_id, job in jobs:
+                started = time.perf_counter()
+                if isinstance(job, BaseException):
+                    report(job_id, started, None, error=str(job))
+                else:
+                    copy_queue.put((job_id, job, started))
+        except Exception as exc:
+            # The rest of the input is unreadable; finish what was queued.
+            report(None, started, None, error=f"Could not read further jobs: {exc}")
+        finally:
+            for _ in copiers:
+                copy_queue.put(done)
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+
+    ctx = multiprocessing.get_context("spawn")
+    pools = [ProcessPoolExecutor(max_workers=cpu_workers, mp_context=ctx)]
+
+    def dispatch() -> None:
+        while True:
+            item = encode_queue.get()
+            if item is done:
+                return
+            job_id, job, started = item
+            in_flight.acquire()
+            try:
+                future = pools[-1].submit(stage_encode, job)
+            except BrokenProcessPool:
+                # A worker died; its jobs fail on their own. Carry on with a new pool.
+                pools.append(ProcessPoolExecutor(max_workers=cpu_workers, mp_context=ctx))
+                future = pools[-1].submit(stage_encode, job)
+            future.add_done_callback(partial(encoded, job_id=job_id, job=job, started=started))
+
+    dispatcher = threading.Thread(target=dispatch, daemon=True)
+    dispatcher.start()
+    feeder.join()
+    for thread in copiers:
+        thread.join()
+    encode_queue.put(done)
+    dispatcher.join()
+    # Shutting down waits for every encode and its callback.
+    for pool in pools:
+        pool.shutdown(wait=True)
+    for _ in writers:
+        write_queue.put(done)
+    for thread in writers:
+        thread.join()
+
+
+def load_journal(journal_path: Path) -> dict:
+    """
+    Read a batch journal into {job id (as str): latest entry}. A torn last line
+    from a crash mid-append is ignored.
+    """
+    entries: dict = {}
+    if not journal_path.exists():
+        return entries
+    with open(journal_path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and "id" in entry:
+                entries[str(entry["id"])] = entry
+    return entries
+
+
+def journal_entry_complete(entry: dict) -> bool:
+    """
+    True when the entry records a success whose files are all still present
+    with their recorded size and sha256. A file whose size and mtime both
+    match the entry is trusted without reading it again.
+    """
+    if not entry.get("ok") or not entry.get("files") or not entry.get("out"):
+        return False
+    out_dir = Path(entry["out"])
+    for name, info in entry["files"].items():
+        try:
+            path = out_dir / name
+            stat = path.stat()
+            if stat.st_size != info["bytes"]:
+                return False
+            if stat.st_mtime_ns != info.get("mtime_ns") and file_digest(path) != info["sha256"]:
+                return False
+        except (OSError, KeyError, TypeError):
+            return False
+    return True
+
+
+def job_spec_hash(job: dict) -> str:
+    """sha256 of a normalized job (job_from_spec output), so an edited spec is not mistaken for a finished one"""
+    canonical = json.dumps(job, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _truncate_torn_tail(path: Path) -> None:
+    # Drop a partial last line left by a crash mid-append, so the next
+    # entry starts on a line of its own.
+    try:
+        with open(path, "r+b") as fh:
+            size = fh.seek(0, os.SEEK_END)
+            if not size:
+                return
+            fh.seek(size - 1)
+            if fh.read(1) == b"\n":
+                return
+            keep = size
+            while keep > 0:
+                step = min(keep, 64 * 1024)
+                fh.seek(keep - step)
+                cut = fh.read(step).rfind(b"\n")
+                if cut >= 0:
+                    keep = keep - step + cut + 1
+                    break
+                keep -= step
+            fh.truncate(keep)
+            fh.flush()
+            os.fsync(fh.fileno())
+    except FileNotFoundError:
+        pass
+
+
+def run_batch(jobs_file: Path, out_dir: Path, io_threads: int = 4, cpu_workers: Optional[int] = None, queue_depth: int = 8, resume: bool = False, journal_path: Optional[Path] = None) -> int:
+    """
+    Run every JSON job spec in jobs_file (one per line, as for --daemon)
+    through run_pipeline. Jobs without "out" write to out_dir/<id>; the id
+    defaults to the line number. One JSON result per job is printed.
+
+    Every result is appended and fsynced to a journal (default
+    out_dir/.stego_journal.jsonl) together with the sha256 of each output
+    and of the normalized spec. With resume, jobs the journal records as done
+    with the same spec, whose outputs are still in place and unchanged, are
+    skipped; failed, edited and unfinished jobs run again.
+    """
+    if not jobs_file.exists() or not jobs_file.is_file():
+        print(f"{Colors.RED}❌ Error: Job file not found: {jobs_file}{Colors.END}", file=sys.stderr)
+        return 2
+
+    for name, value in (("io_threads", io_threads), ("cpu_workers", cpu_workers), ("queue_depth", queue_depth)):
+        if value is not None and value < 1:
+            print(f"{Colors.RED}❌ Error: {name} must be at least 1, got {value}{Colors.END}", file=sys.stderr)
+            return 2
+
+    journal_path = journal_path or out_dir / ".stego_journal.jsonl"
+    # Outputs are only checked for jobs still in jobs_file whose spec matches.
+    finished: dict = {}
+    if resume:
+        finished = {job_id: entry for job_id, entry in load_journal(journal_path).items() if entry.get("ok")}
+    spec_hashes: dict = {}
+    counts = {"ok": 0, "failed": 0, "skipped": 0}
+
+    def jobs():
+        # Lines are decoded one at a time so a bad byte only fails its own job.
+        with open(jobs_file, "rb") as fh:
+            for line_no, raw in enumerate(fh, start=1):
+                if not raw.strip():
+                    continue
+                job_id = line_no
+                try:
+                    spec = json.loads(raw.decode("utf-8"))
+                    if not isinstance(spec, dict):
+                        raise ValueError("job spec must be a JSON object")
+                    job_id = spec.get("id", line_no)
+                    job = job_from_spec(spec, out_dir / str(job_id))
+                    spec_hash = job_spec_hash(job)
+                    entry = finished.get(str(job_id), {})
+                    if entry.get("spec_hash") == spec_hash and journal_entry_complete(entry):
+                        counts["skipped"] += 1
+                        continue
+                    spec_hashes[str(job_id)] = spec_hash
+                except Exception as exc:
+                    yield job_id, ValueError(f"Invalid job spec: {exc}")
+                else:
+                    yield job_id, job
+
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+    if resume:
+        _truncate_torn_tail(journal_path)
+    with open(journal_path, "a" if resume else "w", encoding="utf-8") as journal:
+
+        def on_result(result: dict) -> None:
+            counts["ok" if result["ok"] else "failed"] += 1
+            if str(result["id"]) in spec_hashes:
+                result["spec_hash"] = spec_hashes[str(result["id"])]
+            line = json.dumps(result) + "\n"
+            journal.write(line)
+            journal.flush()
+            os.fsync(journal.fileno())
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+        start = time.perf_counter()
+        run_pipeline(jobs(), on_result, io_threads, cpu_workers, queue_depth)
+        elapsed = time.perf_counter() - start
+
+    color = Colors.GREEN if not counts["failed"] else Colors.YELLOW
+    print(
+        f"{color}📦 Batch finished: {counts['ok']} succeeded, {counts['failed']} failed, "
+        f"{counts['skipped']} skipped (already done) in {elapsed:.2f}s{Colors.END}",
+        file=sys.stderr,
+    )
+    if counts["failed"]:
+        print(f"{Colors.YELLOW}💡 Re-run with --resume to retry only the failed jobs.{Colors.END}", file=sys.stderr)
+    return 1 if counts["failed"] else 0
+
+
+def process_job_lines(lines, write) -> None:
+    """Run each JSON line from lines as a job and write one JSON result line per job"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            spec = json.loads(line)
+            if not isinstance(spec, dict):
+                raise ValueError("job spec must be a JSON object")
+        except ValueError as exc:
+            result = {"id": None, "ok": False, "exit_code": 2, "error": f"Invalid job spec: {exc}"}
+        else:
+            result = run_job(spec)
+        write(json.dumps(result) + "\n")
+
+
+def run_daemon(socket_path: Optional[str], cache_bytes: int) -> int:
+    """
+    Serve JSON-lines jobs from stdin (results on stdout) or from clients of a
+    Unix socket, keeping Pillow, decoded carriers and probe results warm.
+    """
+    enable_job_caches(cache_bytes)
+
+    if socket_path is None:
+        def write_stdout(text: str) -> None:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+        process_job_lines(sys.stdin, write_stdout)
+        return 0
+
+    if not hasattr(socket, "AF_UNIX"):
+        print(f"{Colors.RED}❌ Error: --socket requires Unix domain socket support{Colors.END}", file=sys.stderr)
+        return 2
+
+    class JobHandler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            lines = (raw.decode("utf-8", errors="replace") for raw in self.rfile)
+            process_job_lines(lines, lambda text: self.wfile.write(text.encode("utf-8")))
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    # Service managers stop daemons with SIGTERM; shut down as on Ctrl+C.
+    signal.signal(signal.SIGTERM, stop)
+    path = Path(socket_path).expanduser()
+    if path.is_socket():
+        # Only clear a stale socket; never take over one a live daemon is serving.
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()
+        else:
+            print(f"{Colors.RED}❌ Error: another daemon is already listening on {path}{Colors.END}", file=sys.stderr)
+            return 2
+        finally:
+            probe.close()
+    with socketserver.UnixStreamServer(str(path), JobHandler) as server:
+        print(f"{Colors.GREEN}🛠️  Waiting for jobs on {path}{Colors.END}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(f"\n{Colors.YELLOW}🛑 Daemon stopped.{Colors.END}", file=sys.stderr)
+        finally:
+            _unlink_quietly(path)
+    return 0
+
+
+class ReusableTCPServer(socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+class ReusableThreadingTCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def make_server(directory: Path, host: str, port: int, threaded: bool = False, quiet: bool = False) -> socketserver.TCPServer:
+    """Static file server for directory; threaded handles each connection on its own thread"""
+    handler_base = QuietRequestHandler if quiet else RangeRequestHandler
+    handler_cls = partial(handler_base, directory=str(directory))
+    server_cls = ReusableThreadingTCPServer if threaded else ReusableTCPServer
+    return server_cls((host, port), handler_cls)
+
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=first-last" Range header (either end may be omitted)
+    for a file of size bytes into an inclusive (first, last). Returns None for
+    headers that should be ignored (malformed, or several ranges) and raises
+    ValueError when the range cannot be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    first_text, sep, last_text = spec.partition("-")
+    first_text, last_text = first_text.strip(), last_text.strip()
+    if unit.strip().lower() != "bytes" or not sep or "," in spec:
+        return None
+    if not (first_text + last_text).isdigit():
+        return None
+    if size == 0:
+        raise ValueError("cannot take a range of an empty file")
+    if not first_text:
+        suffix = int(last_text)
+        if suffix == 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - suffix), size - 1
+    first = int(first_text)
+    if last_text and int(last_text) < first:
+        return None
+    if first >= size:
+        raise ValueError(f"range starts beyond the end of a {size}-byte file")
+    return first, min(int(last_text), size - 1) if last_text else size - 1
+
+
+class RangeRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """SimpleHTTPRequestHandler that answers a single byte range with 206, so video seeks fetch only what they ask for"""
+
+    byte_range: Optional[Tuple[int, int]] = None
+
+    def send_head(self):
+        self.byte_range = None
+        header = self.headers.get("Range")
+        path = self.translate_path(self.path)
+        if header is None or os.path.isdir(path):
+            return super().send_head()
+        try:
+            fh = open(path, "rb")
+        except OSError:
+            return super().send_head()
+        stat = os.fstat(fh.fileno())
+        try:
+            span = parse_byte_range(header, stat.st_size)
+        except ValueError:
+            fh.close()
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{stat.st_size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+        if span is None:
+            fh.close()
+            return super().send_head()
+        first, last = self.byte_range = span
+        self.send_response(206)
+        self.send_header("Content-type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {first}-{last}/{stat.st_size}")
+        self.send_header("Content-Length", str(last - first + 1))
+        self.send_header("Last-Modified", self.date_time_string(int(stat.st_mtime)))
+        self.end_headers()
+        return fh
+
+    def copyfile(self, source, outputfile) -> None:
+        if self.byte_range is None:
+            return super().copyfile(source, outputfile)
+        first, last = self.byte_range
+        source.seek(first)
+        remaining = last - first + 1
+        while remaining > 0:
+            chunk = source.read(min(remaining, 1 << 16))
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            remaining -= len(chunk)
+
+
+class QuietRequestHandler(RangeRequestHandler):
+    """RangeRequestHandler without per-request logging, for load tests"""
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def serve_directory(directory: Path, host: str, port: int, threaded: bool = False) -> int:
+    with make_server(directory, host, port, threaded) as httpd:
         print(f"\n{Colors.GREEN}🌐 Serving {directory} on http://{host}:{port}{Colors.END}")
         print(f"{Colors.YELLOW}Press Ctrl+C to stop{Colors.END}")
         try:
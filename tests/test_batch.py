@@ -0,0 +1,137 @@
+import json
+import os
+import struct
+import threading
+import zlib
+
+import stego_linker
+
+
+def write_png(path, width=4, height=4):
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    rows = b"".join(b"\x00" + b"\x80\x40\x20" * width for _ in range(height))
+    path.write_bytes(
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+def job_line(media, url, **extra):
+    return json.dumps({"media": str(media), "url": url, **extra}).encode("utf-8") + b"\n"
+
+
+def run_batch(jobs_file, out_dir, resume=False):
+    # A hung pipeline must fail the test instead of blocking it forever.
+    outcome = {}
+    thread = threading.Thread(
+        target=lambda: outcome.update(code=stego_linker.run_batch(jobs_file, out_dir, io_threads=2, cpu_workers=1, resume=resume)),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(timeout=60)
+    assert not thread.is_alive(), "batch did not finish"
+    return outcome["code"]
+
+
+def results(capsys):
+    return {r["id"]: r for r in map(json.loads, capsys.readouterr().out.splitlines())}
+
+
+def test_malformed_specs_fail_alone(tmp_path, capsys):
+    media = tmp_path / "carrier.png"
+    write_png(media)
+    jobs_file = tmp_path / "jobs.jsonl"
+    jobs_file.write_bytes(
+        job_line(media, "https://example.com/1")
+        + job_line(media, "https://example.com/2", frames=None)
+        + job_line(media, "https://example.com/3", frames=[2])
+        + b'{"media": "carrier.png", "url": "https://example.com/\xff"}\n'
+        + b"not json\n"
+        + job_line(media, "https://example.com/6")
+    )
+
+    assert run_batch(jobs_file, tmp_path / "out") == 1
+
+    by_id = results(capsys)
+    assert sorted(by_id) == [1, 2, 3, 4, 5, 6]
+    assert [job_id for job_id, r in sorted(by_id.items()) if r["ok"]] == [1, 6]
+    assert (tmp_path / "out" / "6" / "index.html").exists()
+
+
+def test_resume_after_torn_journal_line(tmp_path, capsys):
+    media = tmp_path / "carrier.png"
+    write_png(media)
+    jobs_file = tmp_path / "jobs.jsonl"
+    out_dir = tmp_path / "out"
+    journal = out_dir / ".stego_journal.jsonl"
+    jobs_file.write_bytes(job_line(media, "https://example.com/1") + job_line(media, "https://example.com/2"))
+    assert run_batch(jobs_file, out_dir) == 0
+    capsys.readouterr()
+
+    # Crash mid-append, then edit job 2 without changing its id.
+    with open(journal, "ab") as fh:
+        fh.write(b'{"id": 2, "ok": tr')
+    jobs_file.write_bytes(job_line(media, "https://example.com/1") + job_line(media, "https://example.com/changed"))
+
+    assert run_batch(jobs_file, out_dir, resume=True) == 0
+
+    assert sorted(results(capsys)) == [2]
+    entries = [json.loads(line) for line in journal.read_text(encoding="utf-8").splitlines()]
+    assert sorted(entry["id"] for entry in entries) == [1, 2, 2]
+    assert "https://example.com/changed" in (out_dir / "2" / "index.html").read_text(encoding="utf-8")
+
+    # Nothing changed since, so a second resume skips everything.
+    assert run_batch(jobs_file, out_dir, resume=True) == 0
+    assert results(capsys) == {}
+
+
+def test_pipeline_sizes_below_one_are_rejected(tmp_path, capsys):
+    media = tmp_path / "carrier.png"
+    write_png(media)
+    jobs_file = tmp_path / "jobs.jsonl"
+    jobs_file.write_bytes(job_line(media, "https://example.com/1"))
+
+    for sizes in ({"io_threads": 0}, {"cpu_workers": 0}, {"queue_depth": 0}):
+        assert stego_linker.run_batch(jobs_file, tmp_path / "out", **sizes) == 2
+    assert capsys.readouterr().out == ""
+
+
+def test_resume_reruns_job_whose_output_changed(tmp_path, capsys):
+    media = tmp_path / "carrier.png"
+    write_png(media)
+    jobs_file = tmp_path / "jobs.jsonl"
+    out_dir = tmp_path / "out"
+    jobs_file.write_bytes(job_line(media, "https://example.com/1") + job_line(media, "https://example.com/2"))
+    assert run_batch(jobs_file, out_dir) == 0
+    capsys.readouterr()
+
+    page = out_dir / "2" / "index.html"
+    original = page.read_bytes()
+    page.write_bytes(original.replace(b"example.com", b"example.org"))
+    os.utime(page, ns=(0, 0))
+
+    assert run_batch(jobs_file, out_dir, resume=True) == 0
+    assert sorted(results(capsys)) == [2]
+    assert page.read_bytes() == original
+
+
+def test_bad_choices_fail_before_any_output(tmp_path, capsys):
+    media = tmp_path / "carrier.png"
+    write_png(media)
+    jobs_file = tmp_path / "jobs.jsonl"
+    jobs_file.write_bytes(
+        job_line(media, "https://example.com/1", warm="bogus", stego=True)
+        + job_line(media, "https://example.com/2", video_preload="sometimes")
+    )
+
+    assert run_batch(jobs_file, tmp_path / "out") == 1
+
+    by_id = results(capsys)
+    assert "'warm' must be one of" in by_id[1]["error"]
+    assert "'video_preload' must be one of" in by_id[2]["error"]
+    assert not (tmp_path / "out" / "1").exists()
+    assert not (tmp_path / "out" / "2").exists()
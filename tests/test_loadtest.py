@@ -0,0 +1,17 @@
+import pytest
+
+import stego_linker
+
+
+def test_loadtest_target_keeps_scheme_port_and_prefix():
+    assert stego_linker.parse_loadtest_target("https://cdn.example.com/site/") == ("https", "cdn.example.com", 443, "/site")
+    assert stego_linker.parse_loadtest_target("http://127.0.0.1:8080") == ("http", "127.0.0.1", 8080, "")
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["ftp://example.com/", "127.0.0.1:8080", "http://", "http://example.com:99999/", "http://u:p@example.com/", "http://example.com/?q=1"],
+)
+def test_loadtest_target_rejects_unsupported_urls(url):
+    with pytest.raises(ValueError):
+        stego_linker.parse_loadtest_target(url)
@@ -0,0 +1,63 @@
+import pytest
+
+import stego_linker
+
+Image = pytest.importorskip("PIL.Image")
+
+SIZE = (37, 21)
+
+
+def save(tmp_path, name, mode="RGB", **params):
+    path = tmp_path / name
+    Image.new(mode, SIZE, (200, 100, 50, 128)[: len(mode)]).save(path, **params)
+    return path
+
+
+def webp_chunk(path):
+    return path.read_bytes()[12:16]
+
+
+@pytest.mark.parametrize(
+    "name, mode, params",
+    [
+        ("plain.png", "RGB", {}),
+        ("plain.gif", "RGB", {}),
+        ("plain.bmp", "RGB", {}),
+        ("baseline.jpg", "RGB", {}),
+        ("progressive.jpg", "RGB", {"progressive": True}),
+    ],
+)
+def test_probe_reads_header_size(tmp_path, name, mode, params):
+    path = save(tmp_path, name, mode, **params)
+
+    assert stego_linker.probe_image_size(path) == SIZE
+
+
+@pytest.mark.parametrize(
+    "chunk, mode, params",
+    [
+        (b"VP8 ", "RGB", {"lossless": False}),
+        (b"VP8L", "RGB", {"lossless": True}),
+        (b"VP8X", "RGBA", {"lossless": False}),
+    ],
+)
+def test_probe_reads_webp_variants(tmp_path, chunk, mode, params):
+    path = save(tmp_path, "image.webp", mode, **params)
+    assert webp_chunk(path) == chunk
+
+    assert stego_linker.probe_image_size(path) == SIZE
+
+
+def test_probe_gives_up_on_unknown_or_truncated_files(tmp_path):
+    text = tmp_path / "notes.png"
+    text.write_bytes(b"not an image at all")
+    truncated = tmp_path / "cut.jpg"
+    truncated.write_bytes(save(tmp_path, "full.jpg").read_bytes()[:20])
+
+    assert stego_linker.probe_image_size(text) is None
+    assert stego_linker.probe_image_size(truncated) is None
+
+
+def test_capacity_matches_lsb_layout():
+    # Three channel bits per pixel, minus the 32-bit length header.
+    assert stego_linker.stego_capacity_bytes(SIZE) == (SIZE[0] * SIZE[1] * 3 - 32) // 8
@@ -0,0 +1,85 @@
+import http.client
+import socketserver
+import threading
+
+import pytest
+
+import stego_linker
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=5-", (5, 9)),
+        ("bytes=-3", (7, 9)),
+        ("bytes=2-999", (2, 9)),
+        ("bytes=9-2", None),
+        ("bytes=a-b", None),
+        ("bytes=0-1,3-4", None),
+        ("items=0-1", None),
+    ],
+)
+def test_parse_byte_range(header, expected):
+    assert stego_linker.parse_byte_range(header, 10) == expected
+
+
+@pytest.mark.parametrize("header, size", [("bytes=10-", 10), ("bytes=-0", 10), ("bytes=0-0", 0)])
+def test_unsatisfiable_ranges_raise(header, size):
+    with pytest.raises(ValueError):
+        stego_linker.parse_byte_range(header, size)
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / "clip.mp4").write_bytes(bytes(range(256)) * 4)
+    httpd = stego_linker.make_server(tmp_path, "127.0.0.1", 0, threaded=True, quiet=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch(port, path, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+def test_range_request_gets_206_and_only_those_bytes(server):
+    status, headers, body = fetch(server, "/clip.mp4", {"Range": "bytes=10-19"})
+
+    assert status == 206
+    assert headers["Content-Range"] == "bytes 10-19/1024"
+    assert headers["Content-Length"] == "10"
+    assert body == bytes(range(10, 20))
+
+
+def test_suffix_range_and_whole_file(server):
+    assert fetch(server, "/clip.mp4", {"Range": "bytes=-4"})[2] == bytes(range(252, 256))
+    status, _, body = fetch(server, "/clip.mp4")
+    assert status == 200 and len(body) == 1024
+
+
+def test_unsatisfiable_range_gets_416(server):
+    status, headers, body = fetch(server, "/clip.mp4", {"Range": "bytes=5000-"})
+
+    assert status == 416
+    assert headers["Content-Range"] == "bytes */1024"
+    assert body == b""
+
+
+def test_range_on_missing_file_is_404(server):
+    assert fetch(server, "/missing.mp4", {"Range": "bytes=0-1"})[0] == 404
+
+
+def test_make_server_leaves_stdlib_classes_alone(tmp_path):
+    stego_linker.make_server(tmp_path, "127.0.0.1", 0, threaded=True).server_close()
+
+    assert socketserver.TCPServer.allow_reuse_address is False
+    assert socketserver.ThreadingTCPServer.daemon_threads is False